@@ -1,10 +1,13 @@
+#include <pybind11/operators.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
 #include <iomanip>
+#include <iterator>
+#include <optional>
 #include <sstream>
+#include <string_view>
 #include <unordered_map>
-#include <variant>
 
 #include "nyxstone.h"
 
@@ -12,76 +15,388 @@ namespace py = pybind11;
 
 using namespace nyxstone;
 
-class NyxstoneError {
+/// Byte code returned to python, converted to a bytes object after the GIL has been reacquired.
+class Bytes {
 public:
-    std::string err;
+    std::vector<uint8_t> data;
 };
 
-std::vector<Nyxstone::LabelDefinition> convert_labels(std::unordered_map<std::string, uint64_t>&& labels)
+/// Byte code passed in from python.
+///
+/// Objects supporting the buffer protocol (bytes, bytearray, memoryview, ...) are viewed without copying, sequences of
+/// integers are converted to an owned vector.
+class ByteCode {
+public:
+    ByteCode() = default;
+
+    explicit ByteCode(py::buffer_info&& info)
+        : m_info(std::move(info))
+    {
+    }
+
+    explicit ByteCode(std::vector<uint8_t>&& bytes)
+        : m_bytes(std::move(bytes))
+    {
+    }
+
+    llvm::ArrayRef<uint8_t> view() const
+    {
+        if (m_info) {
+            return { static_cast<const uint8_t*>(m_info->ptr), static_cast<size_t>(m_info->size) };
+        }
+        return m_bytes;
+    }
+
+private:
+    std::optional<py::buffer_info> m_info;
+    std::vector<uint8_t> m_bytes;
+};
+
+namespace pybind11::detail {
+template <> struct type_caster<ByteCode> {
+public:
+    PYBIND11_TYPE_CASTER(ByteCode, const_name("bytes | list[int]"));
+
+    bool load(handle src, bool convert)
+    {
+        if (PyObject_CheckBuffer(src.ptr()) != 0) {
+            auto info = reinterpret_borrow<buffer>(src).request();
+            // Only contiguous buffers of single bytes can be viewed as byte code, other buffers are copied
+            if (info.ndim == 1 && info.itemsize == 1 && info.strides[0] == 1) {
+                value = ByteCode(std::move(info));
+                return true;
+            }
+
+            std::vector<uint8_t> bytes(static_cast<size_t>(info.size * info.itemsize));
+            if (PyBuffer_ToContiguous(bytes.data(), info.view(), static_cast<Py_ssize_t>(bytes.size()), 'C') != 0) {
+                throw error_already_set();
+            }
+            value = ByteCode(std::move(bytes));
+            return true;
+        }
+
+        make_caster<std::vector<uint8_t>> bytes_caster;
+        if (!bytes_caster.load(src, convert)) {
+            return false;
+        }
+        value = ByteCode(cast_op<std::vector<uint8_t>&&>(std::move(bytes_caster)));
+        return true;
+    }
+};
+
+template <> struct type_caster<Bytes> {
+public:
+    PYBIND11_TYPE_CASTER(Bytes, const_name("bytes"));
+
+    static handle cast(const Bytes& src, return_value_policy /* policy */, handle /* parent */)
+    {
+        return PyBytes_FromStringAndSize(
+            reinterpret_cast<const char*>(src.data.data()), static_cast<Py_ssize_t>(src.data.size()));
+    }
+};
+} // namespace pybind11::detail
+
+using Labels = std::optional<std::unordered_map<std::string, uint64_t>>;
+
+std::vector<Nyxstone::LabelDefinition> convert_labels(Labels&& labels)
 {
     std::vector<Nyxstone::LabelDefinition> vlabels {};
-    vlabels.reserve(labels.size());
+    if (!labels) {
+        return vlabels;
+    }
+    vlabels.reserve(labels->size());
 
-    for (auto [label, address] : labels) {
+    for (auto& [label, address] : *labels) {
         vlabels.push_back(Nyxstone::LabelDefinition { std::move(label), address });
     }
 
     return vlabels;
 }
 
-std::variant<std::vector<uint8_t>, NyxstoneError> assemble(
-    Nyxstone& nyxstone, std::string assembly, uint64_t address, std::unordered_map<std::string, uint64_t> labels)
+/// Immutable label definitions converted once and reused for many assembly calls.
+class LabelTable {
+public:
+    explicit LabelTable(Labels&& labels)
+        : labels(convert_labels(std::move(labels)))
+    {
+    }
+
+    const std::vector<Nyxstone::LabelDefinition> labels;
+};
+
+/// Labels of a single assembly call.
+///
+/// Consists of the preloaded labels followed by the explicitly given labels, which take precedence. Preloaded labels
+/// are used without copying if no explicit labels are given.
+class CallLabels {
+public:
+    CallLabels(const LabelTable* preloaded, Labels&& labels)
+    {
+        if (labels && !labels->empty()) {
+            if (preloaded != nullptr) {
+                m_owned = preloaded->labels;
+            }
+            auto explicit_labels = convert_labels(std::move(labels));
+            m_owned.insert(m_owned.end(), std::make_move_iterator(explicit_labels.begin()),
+                std::make_move_iterator(explicit_labels.end()));
+        } else if (preloaded != nullptr) {
+            m_preloaded = &preloaded->labels;
+        }
+    }
+
+    const std::vector<Nyxstone::LabelDefinition>& get() const
+    {
+        return (m_preloaded != nullptr) ? *m_preloaded : m_owned;
+    }
+
+private:
+    const std::vector<Nyxstone::LabelDefinition>* m_preloaded = nullptr;
+    std::vector<Nyxstone::LabelDefinition> m_owned {};
+};
+
+Bytes assemble(
+    const Nyxstone& nyxstone, std::string assembly, uint64_t address, Labels labels, const LabelTable* preloaded_labels)
+{
+    const CallLabels vlabels(preloaded_labels, std::move(labels));
+
+    auto res = nyxstone.assemble(assembly, address, vlabels.get());
+
+    if (!res) {
+        throw py::value_error(res.error());
+    }
+
+    return Bytes { std::move(res.value()) };
+}
+
+std::vector<Nyxstone::Instruction> assemble_to_instructions(
+    const Nyxstone& nyxstone, std::string assembly, uint64_t address, Labels labels, const LabelTable* preloaded_labels)
 {
-    auto vlabels = convert_labels(std::move(labels));
+    const CallLabels vlabels(preloaded_labels, std::move(labels));
 
-    auto res = nyxstone.assemble(assembly, address, vlabels);
+    auto res = nyxstone.assemble_to_instructions(assembly, address, vlabels.get());
 
     if (!res) {
-        return NyxstoneError { std::move(res.error()) };
+        throw py::value_error(res.error());
     }
 
-    return res.value();
+    return std::move(res.value());
 }
 
-std::variant<std::vector<Nyxstone::Instruction>, NyxstoneError> assemble_to_instructions(
-    Nyxstone& nyxstone, std::string assembly, uint64_t address, std::unordered_map<std::string, uint64_t> labels)
+std::string disassemble(const Nyxstone& nyxstone, const ByteCode& bytes, uint64_t address, uint64_t count)
 {
-    auto vlabels = convert_labels(std::move(labels));
+    auto res = nyxstone.disassemble(bytes.view(), address, count);
 
-    auto res = nyxstone.assemble_to_instructions(assembly, address, vlabels);
+    if (!res) {
+        throw py::value_error(res.error());
+    }
+
+    return std::move(res.value());
+}
+
+std::vector<Nyxstone::Instruction> disassemble_to_instructions(
+    const Nyxstone& nyxstone, const ByteCode& bytes, uint64_t address, uint64_t count)
+{
+    auto res = nyxstone.disassemble_to_instructions(bytes.view(), address, count);
 
     if (!res) {
-        return NyxstoneError { std::move(res.error()) };
+        throw py::value_error(res.error());
     }
 
-    return res.value();
+    return std::move(res.value());
 }
 
-std::variant<std::string, NyxstoneError> disassemble(
-    Nyxstone& nyxstone, std::vector<uint8_t> bytes, uint64_t address, uint64_t count)
+std::pair<std::string, std::vector<Nyxstone::Instruction>> disassemble_full(
+    const Nyxstone& nyxstone, const ByteCode& bytes, uint64_t address, uint64_t count)
 {
-    auto res = nyxstone.disassemble(bytes, address, count);
+    auto res = nyxstone.disassemble_to_instructions(bytes.view(), address, count);
 
     if (!res) {
-        return NyxstoneError { std::move(res.error()) };
+        throw py::value_error(res.error());
+    }
+
+    auto instructions = std::move(res.value());
+
+    // The disassembly text consists of the assembly of all instructions, each terminated by a newline
+    std::string disassembly;
+    for (const auto& insn : instructions) {
+        disassembly += insn.assembly;
+        disassembly += '\n';
     }
 
-    return res.value();
+    return std::make_pair(std::move(disassembly), std::move(instructions));
 }
 
-std::variant<std::vector<Nyxstone::Instruction>, NyxstoneError> disassemble_to_instructions(
-    Nyxstone& nyxstone, std::vector<uint8_t> bytes, uint64_t address, uint64_t count)
+std::vector<Nyxstone::RawInstruction> disassemble_raw(
+    const Nyxstone& nyxstone, const ByteCode& bytes, uint64_t address, uint64_t count)
 {
-    auto res = nyxstone.disassemble_to_instructions(bytes, address, count);
+    auto res = nyxstone.disassemble_to_raw_instructions(bytes.view(), address, count);
 
     if (!res) {
-        return NyxstoneError { std::move(res.error()) };
+        throw py::value_error(res.error());
     }
 
-    return res.value();
+    return std::move(res.value());
+}
+
+std::string batch_error(size_t index, const std::string& error)
+{
+    std::stringstream error_stream;
+    error_stream << "Input " << index << ": " << error;
+    return error_stream.str();
 }
 
-std::variant<std::unique_ptr<Nyxstone>, NyxstoneError> create_nyxstone(
+std::vector<Bytes> assemble_many(const Nyxstone& nyxstone, std::vector<std::string> assemblies, uint64_t address,
+    Labels labels, const LabelTable* preloaded_labels)
+{
+    const CallLabels vlabels(preloaded_labels, std::move(labels));
+
+    std::vector<Bytes> results {};
+    results.reserve(assemblies.size());
+
+    for (size_t i = 0; i < assemblies.size(); ++i) {
+        auto res = nyxstone.assemble(assemblies[i], address, vlabels.get());
+
+        if (!res) {
+            throw py::value_error(batch_error(i, res.error()));
+        }
+
+        results.push_back(Bytes { std::move(res.value()) });
+    }
+
+    return results;
+}
+
+std::vector<std::string> disassemble_many(
+    const Nyxstone& nyxstone, const std::vector<ByteCode>& bytecodes, uint64_t address, uint64_t count)
+{
+    std::vector<std::string> results {};
+    results.reserve(bytecodes.size());
+
+    for (size_t i = 0; i < bytecodes.size(); ++i) {
+        auto res = nyxstone.disassemble(bytecodes[i].view(), address, count);
+
+        if (!res) {
+            throw py::value_error(batch_error(i, res.error()));
+        }
+
+        results.push_back(std::move(res.value()));
+    }
+
+    return results;
+}
+
+/// Iterator over the instruction details of byte code.
+///
+/// Instructions are disassembled on demand in chunks of at most CHUNK_SIZE instructions, so memory usage does not
+/// depend on the size of the byte code and the first instruction is available without disassembling everything. If
+/// disassembling fails, all instructions in front of the failing one are returned before the error is raised.
+class InstructionIterator {
+public:
+    static constexpr uint64_t CHUNK_SIZE = 64;
+
+    InstructionIterator(const Nyxstone& nyxstone, ByteCode&& bytes, uint64_t address, uint64_t count)
+        : m_nyxstone(nyxstone)
+        , m_bytes(std::move(bytes))
+        , m_address(address)
+        , m_count(count)
+    {
+    }
+
+    Nyxstone::Instruction next()
+    {
+        if (m_index == m_chunk.size()) {
+            if (m_error) {
+                const std::string error = std::move(*m_error);
+                m_error.reset();
+                throw py::value_error(error);
+            }
+            refill();
+        }
+
+        return std::move(m_chunk[m_index++]);
+    }
+
+private:
+    void refill()
+    {
+        const auto bytes = m_bytes.view();
+        if (m_done || m_offset >= bytes.size()) {
+            throw py::stop_iteration();
+        }
+
+        // A count of 0 means all instructions
+        const uint64_t chunk_count = (m_count == 0) ? CHUNK_SIZE : std::min(m_count - m_disassembled, CHUNK_SIZE);
+
+        auto res
+            = m_nyxstone.disassemble_to_instructions(bytes.drop_front(m_offset), m_address + m_offset, chunk_count);
+        m_index = 0;
+        if (!res) {
+            m_done = true;
+            refill_until_error(bytes, chunk_count);
+            if (m_chunk.empty()) {
+                const std::string error = std::move(*m_error);
+                m_error.reset();
+                throw py::value_error(error);
+            }
+            return;
+        }
+
+        m_chunk = std::move(res.value());
+        if (m_chunk.empty()) {
+            throw py::stop_iteration();
+        }
+
+        for (const auto& insn : m_chunk) {
+            m_offset += insn.bytes.size();
+        }
+        m_disassembled += m_chunk.size();
+        m_done = m_count != 0 && m_disassembled >= m_count;
+    }
+
+    // Disassembles the chunk instruction by instruction to keep the instructions in front of the failing one. The error
+    // is stored and raised once these instructions have been returned.
+    void refill_until_error(llvm::ArrayRef<uint8_t> bytes, uint64_t chunk_count)
+    {
+        m_chunk.clear();
+        for (uint64_t i = 0; i < chunk_count && m_offset < bytes.size(); ++i) {
+            auto res = m_nyxstone.disassemble_to_instructions(bytes.drop_front(m_offset), m_address + m_offset, 1);
+            if (!res) {
+                m_error = rebase_error(std::move(res.error()), m_offset);
+                return;
+            }
+            m_offset += res.value().front().bytes.size();
+            m_chunk.push_back(std::move(res.value().front()));
+        }
+    }
+
+    // Errors report positions relative to the disassembled bytes, which start at `offset` within the byte code. The
+    // position is moved by `offset`, so the error matches the error of disassembling the whole byte code at once.
+    static std::string rebase_error(std::string&& error, uint64_t offset)
+    {
+        constexpr std::string_view prefix = "Could not disassemble at position ";
+        if (error.rfind(prefix, 0) != 0) {
+            return std::move(error);
+        }
+
+        const size_t end = error.find(' ', prefix.size());
+        const uint64_t position = std::stoull(error.substr(prefix.size(), end - prefix.size()));
+        error.replace(prefix.size(), end - prefix.size(), std::to_string(position + offset));
+        return std::move(error);
+    }
+
+    const Nyxstone& m_nyxstone;
+    ByteCode m_bytes;
+    uint64_t m_address;
+    uint64_t m_count;
+    uint64_t m_offset = 0;
+    uint64_t m_disassembled = 0;
+    bool m_done = false;
+    std::vector<Nyxstone::Instruction> m_chunk {};
+    size_t m_index = 0;
+    std::optional<std::string> m_error {};
+};
+
+std::unique_ptr<Nyxstone> create_nyxstone(
     std::string&& triple, std::string&& cpu, std::string&& features, NyxstoneBuilder::IntegerBase immediate_style)
 {
 
@@ -92,7 +407,7 @@ std::variant<std::unique_ptr<Nyxstone>, NyxstoneError> create_nyxstone(
                    .build();
 
     if (!res) {
-        return NyxstoneError { res.error() };
+        throw py::value_error(res.error());
     }
 
     return std::move(res.value());
@@ -103,13 +418,27 @@ PYBIND11_MODULE(nyxstone_cpp, m)
     m.doc() = "pybind11 plugin for nyxstone";
 
     py::class_<Nyxstone::Instruction>(m, "Instruction")
-        .def(py::init<uint64_t, std::string, std::vector<uint8_t>>(), py::arg("address"), py::arg("assembly"),
-            py::arg("bytes"))
+        .def(py::init([](uint64_t address, std::string assembly, const ByteCode& bytes) {
+            const auto view = bytes.view();
+            return Nyxstone::Instruction { address, std::move(assembly),
+                std::vector<uint8_t>(view.begin(), view.end()) };
+        }),
+            py::arg("address"), py::arg("assembly"), py::arg("bytes"))
         .def_readwrite("address", &Nyxstone::Instruction::address, "The address of the instruction")
-        .def_readwrite("bytes", &Nyxstone::Instruction::bytes, "The assembled bytes of the instruction")
+        // Bytes are returned as a single bytes object instead of a list of integers
+        .def_property(
+            "bytes",
+            [](const Nyxstone::Instruction& i) {
+                return py::bytes(reinterpret_cast<const char*>(i.bytes.data()), i.bytes.size());
+            },
+            [](Nyxstone::Instruction& i, const ByteCode& bytes) {
+                const auto view = bytes.view();
+                i.bytes.assign(view.begin(), view.end());
+            },
+            "The assembled bytes of the instruction")
         .def_readwrite("assembly", &Nyxstone::Instruction::assembly, "The assembly of the instruction")
-        .def("__eq__",
-            [](const Nyxstone::Instruction& self, const Nyxstone::Instruction& other) { return self == other; })
+        // Operator overloads return NotImplemented for other types, so comparing with non-instructions yields False
+        .def(py::self == py::self)
         .def("__repr__", [](const Nyxstone::Instruction& i) {
             std::stringstream out;
             out << "<address: 0x" << std::hex << std::setw(8) << std::setfill('0') << i.address << ", assembly: \""
@@ -121,25 +450,85 @@ PYBIND11_MODULE(nyxstone_cpp, m)
             return out.str();
         });
 
+    py::class_<Nyxstone::RawInstruction>(m, "RawInstruction")
+        .def_readonly("address", &Nyxstone::RawInstruction::address, "The address of the instruction")
+        .def_readonly("opcode", &Nyxstone::RawInstruction::opcode, "The LLVM opcode of the instruction")
+        .def_property_readonly(
+            "bytes",
+            [](const Nyxstone::RawInstruction& i) {
+                return py::bytes(reinterpret_cast<const char*>(i.bytes.data()), i.bytes.size());
+            },
+            "The bytes of the instruction")
+        .def(py::self == py::self)
+        .def("__repr__", [](const Nyxstone::RawInstruction& i) {
+            std::stringstream out;
+            out << "<address: 0x" << std::hex << std::setw(8) << std::setfill('0') << i.address
+                << ", opcode: " << std::dec << i.opcode << ", bytes: [ ";
+            for (const auto& b : i.bytes) {
+                out << std::hex << std::setw(2) << std::setfill('0') << static_cast<uint32_t>(b) << " ";
+            }
+            out << "]>";
+            return out.str();
+        });
+
+    py::class_<InstructionIterator>(m, "InstructionIterator")
+        .def("__iter__", [](InstructionIterator& it) -> InstructionIterator& { return it; })
+        // The GIL is kept while disassembling a chunk, as it serializes threads sharing the iterator
+        .def("__next__", &InstructionIterator::next);
+
     py::enum_<NyxstoneBuilder::IntegerBase>(m, "IntegerBase")
         .value("Dec", NyxstoneBuilder::IntegerBase::Dec, "Decimal printing")
         .value("HexPrefix", NyxstoneBuilder::IntegerBase::HexPrefix, "Hex, prefixed with '0x'")
         .value("HexSuffix", NyxstoneBuilder::IntegerBase::HexSuffix, "Hex, suffixed with 'h'");
 
-    py::class_<NyxstoneError>(m, "NyxstoneError").def(py::init()).def_readwrite("err", &NyxstoneError::err);
+    py::class_<LabelTable>(m, "LabelTable")
+        .def(py::init<Labels&&>(), py::arg("labels"))
+        .def("__len__", [](const LabelTable& table) { return table.labels.size(); });
 
+    // All calls into nyxstone release the GIL, arguments are converted to C++ types beforehand and results are
+    // converted to python objects after reacquiring it. Nyxstone instances can be used concurrently, thus calls on the
+    // same instance run in parallel. Errors are raised as ValueError.
     py::class_<Nyxstone>(m, "NyxstoneFFI")
-        .def("assemble", &assemble, py::arg("assembly"), py::arg("address") = 0x0, py::arg("labels") = py::dict {})
+        .def("assemble", &assemble, py::arg("assembly"), py::arg("address") = 0x0, py::arg("labels") = py::none(),
+            py::arg("preloaded_labels") = py::none(), py::call_guard<py::gil_scoped_release>())
         .def("assemble_to_instructions", &assemble_to_instructions, py::arg("assembly"), py::arg("address") = 0x0,
-            py::arg("labels") = py::dict {})
+            py::arg("labels") = py::none(), py::arg("preloaded_labels") = py::none(),
+            py::call_guard<py::gil_scoped_release>())
         .def("disassemble", &disassemble, py::arg("bytes"), py::arg("address") = 0x0, py::arg("count") = 0,
+            py::call_guard<py::gil_scoped_release>(),
             "Disassemble bytes to assembly text.\n"
             "count specifies the number of instructions to disassemble, '0' means all instructions")
         .def("disassemble_to_instructions", &disassemble_to_instructions, py::arg("bytes"), py::arg("address") = 0x0,
-            py::arg("count") = 0x0,
+            py::arg("count") = 0x0, py::call_guard<py::gil_scoped_release>(),
             "Disassemble bytes to instruction information.\n"
+            "count specifies the number of instructions to disassemble, '0' means all instructions")
+        .def("disassemble_full", &disassemble_full, py::arg("bytes"), py::arg("address") = 0x0, py::arg("count") = 0x0,
+            py::call_guard<py::gil_scoped_release>(),
+            "Disassemble bytes to assembly text and instruction information in a single pass.\n"
+            "count specifies the number of instructions to disassemble, '0' means all instructions")
+        .def("disassemble_raw", &disassemble_raw, py::arg("bytes"), py::arg("address") = 0x0, py::arg("count") = 0x0,
+            py::call_guard<py::gil_scoped_release>(),
+            "Decode bytes to raw instruction information without generating assembly text.\n"
+            "count specifies the number of instructions to decode, '0' means all instructions")
+        .def("assemble_many", &assemble_many, py::arg("assemblies"), py::arg("address") = 0x0,
+            py::arg("labels") = py::none(), py::arg("preloaded_labels") = py::none(),
+            py::call_guard<py::gil_scoped_release>(),
+            "Assemble multiple inputs to bytes with a single call.\n"
+            "Each input is assembled at the given address using the same labels")
+        .def("disassemble_many", &disassemble_many, py::arg("bytecodes"), py::arg("address") = 0x0,
+            py::arg("count") = 0x0, py::call_guard<py::gil_scoped_release>(),
+            "Disassemble multiple byte sequences to assembly text with a single call.\n"
+            "count specifies the number of instructions to disassemble per input, '0' means all instructions")
+        .def(
+            "disassemble_iter",
+            [](const Nyxstone& nyxstone, ByteCode bytes, uint64_t address, uint64_t count) {
+                return InstructionIterator(nyxstone, std::move(bytes), address, count);
+            },
+            py::arg("bytes"), py::arg("address") = 0x0, py::arg("count") = 0x0, py::keep_alive<0, 1>(),
+            "Iterate over the instruction information of bytes, disassembling them on demand.\n"
             "count specifies the number of instructions to disassemble, '0' means all instructions");
 
     m.def("create_nyxstone", &create_nyxstone, py::arg("target_triple"), py::arg("cpu") = "", py::arg("features") = "",
-        py::arg("immediate_style") = NyxstoneBuilder::IntegerBase::Dec, "Create a NyxstoneFFI instance");
+        py::arg("immediate_style") = NyxstoneBuilder::IntegerBase::Dec, py::call_guard<py::gil_scoped_release>(),
+        "Create a NyxstoneFFI instance");
 }
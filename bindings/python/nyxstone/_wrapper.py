@@ -0,0 +1,434 @@
+import functools
+import nyxstone_cpp
+from enum import IntEnum
+from typing import Iterator, Optional, Sequence, Union
+
+
+class IntegerBase(IntEnum):
+    """Styles for immediate printing in Nyxstone.
+
+    Members
+    -------
+    Dec:
+        Decimal printing
+    HexPrefix:
+        Hex, prefixed with '0x'
+    HexSuffix:
+        Hex, suffixed with 'h'
+    """
+
+    Dec = nyxstone_cpp.IntegerBase.Dec
+    HexPrefix = nyxstone_cpp.IntegerBase.HexPrefix
+    HexSuffix = nyxstone_cpp.IntegerBase.HexSuffix
+
+
+# Conversion of immediate styles to their nyxstone_cpp counterparts, computed once at import
+_STYLE_MAP = {style: nyxstone_cpp.IntegerBase(style) for style in IntegerBase}
+
+
+# Building a nyxstone instance sets up the LLVM target, which is expensive compared to a single (dis)assembly call. Thus,
+# instances are shared between all `Nyxstone` objects created with the same configuration. Creation is thread-safe, as
+# the C++ side serializes the LLVM initialization.
+@functools.lru_cache(maxsize=64)
+def _create_nyxstone(
+    target_triple: str, cpu: str, features: str, immediate_style: IntegerBase
+) -> nyxstone_cpp.NyxstoneFFI:
+    return nyxstone_cpp.create_nyxstone(
+        target_triple, cpu, features, _STYLE_MAP[immediate_style]
+    )
+
+
+def clear_cache():
+    """Drops all cached nyxstone instances.
+
+    `Nyxstone` objects created with the same configuration share the underlying LLVM state. Existing `Nyxstone`
+    objects stay valid, subsequently created objects build fresh instances.
+    """
+
+    _create_nyxstone.cache_clear()
+
+
+def _cached_assembler(nyxstone: nyxstone_cpp.NyxstoneFFI, maxsize: int):
+    # The memoized function only references the nyxstone instance, not the `Nyxstone` object holding the cache, so that
+    # no reference cycle is created. Labels are passed as a frozenset of their items to be hashable. Preloaded label
+    # tables are immutable, thus they are part of the key by identity.
+    @functools.lru_cache(maxsize=maxsize)
+    def assemble(
+        assembly: str,
+        address: int,
+        labels: frozenset,
+        preloaded_labels: Optional[nyxstone_cpp.LabelTable],
+    ) -> bytes:
+        return nyxstone.assemble(
+            assembly, address, dict(labels) if labels else None, preloaded_labels
+        )
+
+    return assemble
+
+
+class Instruction(nyxstone_cpp.Instruction):
+    """
+    Extended information of an Instruction.
+
+    Instruction details returned by nyxstone are the underlying `nyxstone_cpp.Instruction` objects, whose attributes
+    are only converted to python objects when accessed. They compare equal to `Instruction` objects holding the same
+    information.
+    """
+
+    # No instance dictionary, the attributes are stored in the underlying C++ object
+    __slots__ = ()
+
+
+class Nyxstone:
+    """
+    Nyxstone class used for assembling and disassembling for a given architecture.
+    """
+
+    def __init__(
+        self,
+        target_triple: str,
+        cpu: str = "",
+        features: str = "",
+        immediate_style: IntegerBase = IntegerBase.Dec,
+        cache_size: int = 4096,
+    ):
+        """
+        Parameters
+        ----------
+        target_triple : str
+            Llvm target triple or architecture identifier of triple.
+        cpu : str, optional
+            Llvm CPU specifier (defaults to no specific CPU).
+        features : str, optional
+            Llvm feature string. The feature string is a comma seperated list of
+            features which are prepended with a '+' for enabling and a '-' for disabling (defaults to no features).
+        immediate_style : IntegerBase, optional
+            Printing style of immediates in disassembly and extended instruction details.
+        cache_size : int, optional
+            Number of results of `assemble` which are memoized for repeated inputs, 0 disables the cache (default is
+            4096).
+
+        Raises
+        ------
+        ValueError
+            If the immediate style is invalid or the creation of the nyxstone instance failed.
+        """
+
+        # Also accepts the nyxstone_cpp counterparts of the immediate styles
+        immediate_style = IntegerBase(int(immediate_style))
+        self.nyxstone = _create_nyxstone(target_triple, cpu, features, immediate_style)
+        self._assemble_cache = (
+            _cached_assembler(self.nyxstone, cache_size) if cache_size > 0 else None
+        )
+        # Labels set by `preload_labels`
+        self._preloaded_labels = None
+
+    def preload_labels(self, labels: dict[str, int]):
+        """Sets label definitions which are used by all subsequent assembly calls of this object.
+
+        The labels are converted once, so that repeatedly assembling with the same labels does not pay for passing
+        them on every call. Labels given to an assembly call are used in addition and take precedence over preloaded
+        labels with the same name. Replaces previously preloaded labels.
+
+        Parameters
+        ----------
+        labels : dict[str, int]
+            Label definitions by absolute address.
+        """
+
+        self._preloaded_labels = nyxstone_cpp.LabelTable(labels) if labels else None
+
+    def clear_labels(self):
+        """Removes the label definitions set by `preload_labels`."""
+
+        self._preloaded_labels = None
+
+    def assemble(
+        self, assembly: str, address: int = 0x0, labels: Optional[dict[str, int]] = None
+    ) -> bytes:
+        """Translates assembly instructions at a given start address to bytes.
+
+        Additional label definitions by absolute address may be supplied.
+        Does not support assembly directives that impact the layout (f. i., .section, .org).
+
+        Parameters
+        ----------
+        assembly : str
+            The assembly instruction(s) to be assembled.
+        address : int, optional
+            The absolute address of the first instruction (default is 0x0).
+        labels : dict[str, int], optional
+            Label definitions, should hold all external labels used in assembly together with the preloaded labels
+            (default is no labels).
+
+        Raises
+        ------
+        ValueError
+            If assembling failed.
+
+        Returns
+        -------
+        bytes
+            The assembled byte code.
+        """
+
+        if self._assemble_cache is not None:
+            frozen_labels = frozenset(labels.items()) if labels else frozenset()
+            return self._assemble_cache(
+                assembly, address, frozen_labels, self._preloaded_labels
+            )
+
+        return self.nyxstone.assemble(assembly, address, labels, self._preloaded_labels)
+
+    def assemble_to_instructions(
+        self, assembly: str, address: int = 0x0, labels: Optional[dict[str, int]] = None
+    ) -> list[nyxstone_cpp.Instruction]:
+        """Translates assembly instructions at given start address to instruction details containing bytes.
+
+        Additional label definitions by absolute address may be supplied.
+        Does not support assembly directives that impact the layout (f. i., .section, .org).
+
+        Parameters
+        ----------
+        assembly : str
+            The assembly instruction(s) to be assembled.
+        address : int, optional
+            The absolute address of the first instruction (default is 0x0).
+        labels : dict[str, int], optional
+            Label definitions, should hold all external labels used in assembly together with the preloaded labels
+            (default is no labels).
+
+        Raises
+        ------
+        ValueError
+            If assembling failed.
+
+        Returns
+        -------
+        list[nyxstone_cpp.Instruction]
+            A list of instruction details.
+        """
+
+        return self.nyxstone.assemble_to_instructions(
+            assembly, address, labels, self._preloaded_labels
+        )
+
+    def disassemble(
+        self, bytecode: Union[bytes, Sequence[int]], address: int = 0x0, count: int = 0
+    ) -> str:
+        """Translates bytes to disassembly text at given start address.
+
+        Parameters
+        ----------
+        bytecode : bytes | Sequence[int]
+            The byte code to be disassembled. Bytes-like objects (bytes, bytearray, memoryview, ...) are passed
+            to nyxstone without copying, unless they are not contiguous.
+        address : int, optional
+            The absolute address of the byte code (default is 0x0).
+        count : int, optional
+            The number of instructions which should be disassembled, 0 means all (default is 0).
+
+        Raises
+        ------
+        ValueError
+            If disassembling failed.
+
+        Returns
+        -------
+        str
+            The disassembled text.
+        """
+
+        return self.nyxstone.disassemble(bytecode, address, count)
+
+    def disassemble_to_instructions(
+        self, bytecode: Union[bytes, Sequence[int]], address: int = 0x0, count: int = 0
+    ) -> list[nyxstone_cpp.Instruction]:
+        """Translates bytes to instruction details containing disassembly text at given start address.
+
+        Parameters
+        ----------
+        bytecode : bytes | Sequence[int]
+            The byte code to be disassembled. Bytes-like objects (bytes, bytearray, memoryview, ...) are passed
+            to nyxstone without copying, unless they are not contiguous.
+        address : int, optional
+            The absolute address of the byte code (default is 0x0).
+        count : int, optional
+            The number of instructions which should be disassembled, 0 means all (default is 0).
+
+        Raises
+        ------
+        ValueError
+            If disassembling failed.
+
+        Returns
+        -------
+        list[nyxstone_cpp.Instruction]
+            A list of instruction details.
+        """
+
+        return self.nyxstone.disassemble_to_instructions(bytecode, address, count)
+
+    def disassemble_full(
+        self, bytecode: Union[bytes, Sequence[int]], address: int = 0x0, count: int = 0
+    ) -> tuple[str, list[nyxstone_cpp.Instruction]]:
+        """Translates bytes to disassembly text and instruction details at given start address in a single pass.
+
+        Use this instead of calling `disassemble` and `disassemble_to_instructions` on the same byte code, which
+        disassembles it twice.
+
+        Parameters
+        ----------
+        bytecode : bytes | Sequence[int]
+            The byte code to be disassembled. Bytes-like objects (bytes, bytearray, memoryview, ...) are passed
+            to nyxstone without copying, unless they are not contiguous.
+        address : int, optional
+            The absolute address of the byte code (default is 0x0).
+        count : int, optional
+            The number of instructions which should be disassembled, 0 means all (default is 0).
+
+        Raises
+        ------
+        ValueError
+            If disassembling failed.
+
+        Returns
+        -------
+        tuple[str, list[nyxstone_cpp.Instruction]]
+            The disassembled text and a list of instruction details.
+        """
+
+        return self.nyxstone.disassemble_full(bytecode, address, count)
+
+    def disassemble_to_raw(
+        self, bytecode: Union[bytes, Sequence[int]], address: int = 0x0, count: int = 0
+    ) -> list[nyxstone_cpp.RawInstruction]:
+        """Decodes bytes to raw instruction details at given start address without generating disassembly text.
+
+        Skipping the text generation makes decoding considerably faster than `disassemble_to_instructions`, use it
+        when only the addresses, sizes or opcodes of the instructions are of interest.
+
+        Parameters
+        ----------
+        bytecode : bytes | Sequence[int]
+            The byte code to be decoded. Bytes-like objects (bytes, bytearray, memoryview, ...) are passed to
+            nyxstone without copying, unless they are not contiguous.
+        address : int, optional
+            The absolute address of the byte code (default is 0x0).
+        count : int, optional
+            The number of instructions which should be decoded, 0 means all (default is 0).
+
+        Raises
+        ------
+        ValueError
+            If decoding failed.
+
+        Returns
+        -------
+        list[nyxstone_cpp.RawInstruction]
+            A list of raw instruction details holding the address, LLVM opcode and bytes of each instruction.
+        """
+
+        return self.nyxstone.disassemble_raw(bytecode, address, count)
+
+    def assemble_many(
+        self,
+        assemblies: list[str],
+        address: int = 0x0,
+        labels: Optional[dict[str, int]] = None,
+    ) -> list[bytes]:
+        """Translates multiple assembly inputs to bytes with a single call into nyxstone.
+
+        Every input is assembled independently at the same start address using the same label definitions.
+        The GIL is released while assembling.
+
+        Parameters
+        ----------
+        assemblies : list[str]
+            The assembly inputs to be assembled.
+        address : int, optional
+            The absolute address of the first instruction of each input (default is 0x0).
+        labels : dict[str, int], optional
+            Label definitions, should hold all external labels used in the inputs together with the preloaded labels
+            (default is no labels).
+
+        Raises
+        ------
+        ValueError
+            If assembling any of the inputs failed.
+
+        Returns
+        -------
+        list[bytes]
+            The assembled byte code for each input, in input order.
+        """
+
+        return self.nyxstone.assemble_many(
+            assemblies, address, labels, self._preloaded_labels
+        )
+
+    def disassemble_many(
+        self,
+        bytecodes: list[Union[bytes, Sequence[int]]],
+        address: int = 0x0,
+        count: int = 0,
+    ) -> list[str]:
+        """Translates multiple byte sequences to disassembly text with a single call into nyxstone.
+
+        Every byte sequence is disassembled independently at the same start address.
+        The GIL is released while disassembling.
+
+        Parameters
+        ----------
+        bytecodes : list[bytes | Sequence[int]]
+            The byte code sequences to be disassembled. Bytes-like objects are passed to nyxstone without copying,
+            unless they are not contiguous.
+        address : int, optional
+            The absolute address of each byte code sequence (default is 0x0).
+        count : int, optional
+            The number of instructions which should be disassembled per sequence, 0 means all (default is 0).
+
+        Raises
+        ------
+        ValueError
+            If disassembling any of the sequences failed.
+
+        Returns
+        -------
+        list[str]
+            The disassembled text for each sequence, in input order.
+        """
+
+        return self.nyxstone.disassemble_many(bytecodes, address, count)
+
+    def disassemble_iter(
+        self, bytecode: Union[bytes, Sequence[int]], address: int = 0x0, count: int = 0
+    ) -> Iterator[nyxstone_cpp.Instruction]:
+        """Lazily translates bytes to instruction details containing disassembly text at given start address.
+
+        Instructions are disassembled on demand in small chunks, so memory usage does not depend on the size of the
+        byte code and iteration can be stopped early without disassembling the remaining bytes.
+
+        Parameters
+        ----------
+        bytecode : bytes | Sequence[int]
+            The byte code to be disassembled. Bytes-like objects (bytes, bytearray, memoryview, ...) are passed
+            to nyxstone without copying, unless they are not contiguous, and must not be modified during
+            iteration.
+        address : int, optional
+            The absolute address of the byte code (default is 0x0).
+        count : int, optional
+            The number of instructions which should be disassembled, 0 means all (default is 0).
+
+        Raises
+        ------
+        ValueError
+            If disassembling failed, raised after all instructions in front of the failing one have been yielded.
+
+        Yields
+        ------
+        nyxstone_cpp.Instruction
+            The instruction details in address order.
+        """
+
+        yield from self.nyxstone.disassemble_iter(bytecode, address, count)
@@ -2,13 +2,21 @@ from glob import glob
 from setuptools import setup
 import os
 import subprocess
+import sys
 
 try:
     from pybind11.setup_helpers import Pybind11Extension
 except ImportError:
     from setuptools import Extension as Pybind11Extension
 
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
 LLVM_PREFIX_NAME = "NYXSTONE_LLVM_PREFIX"
+PGO_NAME = "NYXSTONE_PGO"
+NATIVE_NAME = "NYXSTONE_NATIVE"
 
 
 class ValidLLVMConfig:
@@ -19,14 +27,31 @@ class ValidLLVMConfig:
             else "llvm-config"
         )
 
+        # All information is queried with a single invocation. llvm-config prints the values of the queried options
+        # in the given order, followed by the libraries and the system libraries.
         try:
-            version = subprocess.run(
-                [llvm_config, "--version"], capture_output=True
-            ).stdout.decode("utf-8")
+            output = subprocess.run(
+                [
+                    llvm_config,
+                    "--link-static",
+                    "--version",
+                    "--includedir",
+                    "--ldflags",
+                    "--system-libs",
+                    "--libs",
+                    "core",
+                    "mc",
+                    "all-targets",
+                ],
+                capture_output=True,
+            )
         except FileNotFoundError as e:
             print(f"Could not find llvm-config in ${LLVM_PREFIX_NAME} or $PATH")
             exit(1)
 
+        lines = output.stdout.decode("utf-8").splitlines()
+        version = lines[0] if lines else ""
+
         major_version = version.split(".")[0]
 
         if major_version != "15":
@@ -35,64 +60,22 @@ class ValidLLVMConfig:
             )
             exit(1)
 
-        lib_output = subprocess.run(
-            [
-                llvm_config,
-                "--link-static",
-                "--libs",
-            ],
-            capture_output=True,
-        )
-
-        if lib_output.returncode != 0:
+        if output.returncode != 0:
             print(
                 "Cannot link statically, please install LLVM with static linking support"
             )
             exit(1)
 
-        self.config = llvm_config
+        self.include_dir = lines[1].strip()
+        # remove leading -L re-added by pybind
+        self.lib_location = lines[2].replace("-L", "").strip()
+        self.libraries = " ".join(lines[3:]).strip().replace("-l", "").split(" ")
 
     def get_llvm_libraries(self) -> (list[str], str):
-        lib_output = subprocess.run(
-            [
-                self.config,
-                "--link-static",
-                "--system-libs",
-                "--libs",
-                "core",
-                "mc",
-                "all-targets",
-            ],
-            capture_output=True,
-        )
-
-        libraries = (
-            lib_output.stdout.decode("utf-8")
-            .replace("\n", " ")
-            .strip()
-            .replace("-l", "")
-            .split(" ")
-        )
-
-        lib_location = (
-            subprocess.run([self.config, "--ldflags"], capture_output=True)
-            .stdout.decode("utf-8")
-            .replace("\n", "")  # remove trailing '\n'
-            .replace("-L", "")  # remove leading -L re-added by pybind
-            .strip()  # strip trailing whitespace
-        )
-
-        return libraries, lib_location
+        return self.libraries, self.lib_location
 
     def get_llvm_include_dir(self) -> str:
-        llvm_include_dir = (
-            subprocess.run([self.config, "--includedir"], capture_output=True)
-            .stdout.decode("utf-8")
-            .replace("\n", "")
-            .strip()
-        )
-
-        return llvm_include_dir
+        return self.include_dir
 
 
 llvm = ValidLLVMConfig()
@@ -107,6 +90,38 @@ srcs = sorted(nyxstone_srcs + binder)
 
 desc = "Python bindings for the nyxstone library."
 
+if sys.platform == "win32":
+    extra_compile_args = ["/O2", "/GL"]
+    extra_link_args = ["/LTCG"]
+else:
+    # Link time optimization allows inlining across the binding and the nyxstone sources
+    extra_compile_args = ["-O3", "-flto=auto", "-fvisibility=hidden"]
+    # Linking the C++ runtime statically tries to reduce dependencies
+    extra_link_args = ["-flto=auto", "-static-libstdc++", "-static-libgcc"]
+    if sys.platform.startswith("linux"):
+        extra_compile_args += ["-fno-plt"]
+        extra_link_args += ["-Wl,-O2", "-Wl,-s"]  # optimize and strip the shared object
+
+    # Optimize for the building machine, the resulting extension may not run on other machines
+    if os.getenv(NATIVE_NAME) == "1":
+        extra_compile_args += ["-march=native", "-mtune=native"]
+
+    # Profile guided optimization: build with NYXSTONE_PGO=generate, run a representative workload to record profiles
+    # into the pgo directory and rebuild with NYXSTONE_PGO=use.
+    pgo = os.getenv(PGO_NAME)
+    pgo_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pgo")
+    if pgo == "generate":
+        extra_compile_args += [f"-fprofile-generate={pgo_dir}"]
+        extra_link_args += [f"-fprofile-generate={pgo_dir}"]
+    elif pgo == "use":
+        extra_compile_args += [f"-fprofile-use={pgo_dir}", "-fprofile-correction"]
+        extra_link_args += [f"-fprofile-use={pgo_dir}"]
+    elif pgo is not None:
+        print(
+            f"Invalid value for ${PGO_NAME}, expected 'generate' or 'use', found '{pgo}'"
+        )
+        exit(1)
+
 ext_modules = [
     Pybind11Extension(
         name="nyxstone_cpp",
@@ -114,13 +129,19 @@ ext_modules = [
         include_dirs=["nyxstone-cpp/include/", "nyxstone-cpp/src/", llvm_inc_dir],
         libraries=llvm_libs,
         library_dirs=[llvm_lib_dir],
-        extra_link_args=[
-            "-static-libstdc++",
-            "-static-libgcc",
-        ],  # try to reduce dependencies
+        extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
     )
 ]
 
+# Compiling the python wrapper with Cython removes interpreter overhead from every call. Without Cython, the wrapper is
+# used as a pure python module.
+if cythonize is not None:
+    ext_modules += cythonize(
+        ["nyxstone/_wrapper.py"],
+        compiler_directives={"language_level": "3", "annotation_typing": False},
+    )
+
 setup(
     name="nyxstone",
     version="0.1.0",
@@ -1,38 +1,180 @@
-from nyxstone import Nyxstone, Instruction, IntegerBase
+import nyxstone_cpp
+from concurrent.futures import ThreadPoolExecutor
+from nyxstone import Nyxstone, Instruction, IntegerBase, clear_cache
 
 nyxstone = Nyxstone("x86_64")
 
 # basic functionality
-assert nyxstone.assemble("mov rax, rax") == [0x48, 0x89, 0xC0]
+assert nyxstone.assemble("mov rax, rax") == bytes([0x48, 0x89, 0xC0])
+assert nyxstone.disassemble(bytes([0x48, 0x89, 0xC0])) == "mov rax, rax\n"
+# lists of integers and other bytes-like objects are accepted for byte code as well
 assert nyxstone.disassemble([0x48, 0x89, 0xC0]) == "mov rax, rax\n"
+assert (
+    nyxstone.disassemble(memoryview(bytearray([0x48, 0x89, 0xC0]))) == "mov rax, rax\n"
+)
+# buffers which are not contiguous are copied
+assert nyxstone.disassemble(memoryview(b"\x90\x00\x90")[::2]) == "nop\nnop\n"
 # reordering of arguments
 assert nyxstone.assemble(
     address=0x1000, labels={".label": 0x1200}, assembly="mov rax, rax"
-) == [0x48, 0x89, 0xC0]
+) == bytes([0x48, 0x89, 0xC0])
 
 # inline/external labels
-assert nyxstone.assemble("jmp .label; nop; .label:") == [0xEB, 0x01, 0x90]
-assert nyxstone.assemble("jmp .label", labels={".label": 0x1000}) == [
-    0xE9,
-    0xFB,
-    0x0F,
-    0x00,
-    0x00,
-]
+assert nyxstone.assemble("nop", labels=None) == nyxstone.assemble("nop", labels={})
+assert nyxstone.assemble("jmp .label; nop; .label:") == bytes([0xEB, 0x01, 0x90])
+assert nyxstone.assemble("jmp .label", labels={".label": 0x1000}) == bytes(
+    [0xE9, 0xFB, 0x0F, 0x00, 0x00]
+)
 assert nyxstone.assemble_to_instructions("jmp .label", 0x1000, {".label": 0x1200}) == [
-    Instruction(0x1000, "jmp .label", [0xE9, 0xFB, 0x01, 0x00, 0x00])
+    Instruction(0x1000, "jmp .label", bytes([0xE9, 0xFB, 0x01, 0x00, 0x00]))
+]
+
+# preloaded labels
+preloaded = Nyxstone("x86_64")
+preloaded.preload_labels({".label": 0x1000})
+assert preloaded.assemble("jmp .label") == bytes([0xE9, 0xFB, 0x0F, 0x00, 0x00])
+assert preloaded.assemble("jmp .label", labels={".label": 0x1200}) == bytes(
+    [0xE9, 0xFB, 0x11, 0x00, 0x00]
+)
+assert preloaded.assemble_to_instructions("jmp .label", 0x1000) == [
+    Instruction(0x1000, "jmp .label", bytes([0xEB, 0xFE]))
+]
+assert preloaded.assemble_many(["jmp .label"]) == [
+    bytes([0xE9, 0xFB, 0x0F, 0x00, 0x00])
 ]
+preloaded.preload_labels({".label": 0x1200})
+assert preloaded.assemble("jmp .label") == bytes([0xE9, 0xFB, 0x11, 0x00, 0x00])
+preloaded.clear_labels()
+try:
+    preloaded.assemble("jmp .label")
+    assert False
+except ValueError:
+    pass
+# labels are not shared with other objects of the same configuration
+try:
+    nyxstone.assemble("jmp .label")
+    assert False
+except ValueError:
+    pass
 
 # disassembling using address and count
 assert nyxstone.disassemble_to_instructions(
-    [0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8], 0x1000, 0
+    bytes([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8]), 0x1000, 0
 ) == [
-    Instruction(0x1000, "xor rax, rax", [0x48, 0x31, 0xC0]),
-    Instruction(0x1003, "add rax, rbx", [0x48, 0x01, 0xD8]),
+    Instruction(0x1000, "xor rax, rax", bytes([0x48, 0x31, 0xC0])),
+    Instruction(0x1003, "add rax, rbx", bytes([0x48, 0x01, 0xD8])),
 ]
 assert nyxstone.disassemble_to_instructions(
-    [0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8], 0x1000, 1
-) == [Instruction(0x1000, "xor rax, rax", [0x48, 0x31, 0xC0])]
+    bytes([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8]), 0x1000, 1
+) == [Instruction(0x1000, "xor rax, rax", bytes([0x48, 0x31, 0xC0]))]
+
+# disassembling to text and instruction details at once
+text, instructions = nyxstone.disassemble_full(
+    bytes([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8]), 0x1000
+)
+assert text == "xor rax, rax\nadd rax, rbx\n"
+assert instructions == [
+    Instruction(0x1000, "xor rax, rax", bytes([0x48, 0x31, 0xC0])),
+    Instruction(0x1003, "add rax, rbx", bytes([0x48, 0x01, 0xD8])),
+]
+assert nyxstone.disassemble(bytes([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8]), 0x1000) == text
+assert nyxstone.disassemble([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8], 0x1000) == text
+assert nyxstone.disassemble(bytes([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8]), 0x1000, 1) == (
+    "xor rax, rax\n"
+)
+
+# returned instruction details are not shared between calls
+code = bytes([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8])
+first = nyxstone.disassemble_to_instructions(code, 0x1000)
+first[0].address = 0xDEAD
+first[0].assembly = "modified"
+assert nyxstone.disassemble_to_instructions(code, 0x1000) == instructions
+assert nyxstone.disassemble_full(code, 0x1000)[1] == instructions
+
+# decoding without disassembly text
+raw = nyxstone.disassemble_to_raw(bytes([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8]), 0x1000)
+assert [(r.address, r.bytes) for r in raw] == [
+    (0x1000, bytes([0x48, 0x31, 0xC0])),
+    (0x1003, bytes([0x48, 0x01, 0xD8])),
+]
+assert raw[0].opcode != raw[1].opcode
+assert nyxstone.disassemble_to_raw(
+    bytes([0x48, 0x31, 0xC0, 0x48, 0x31, 0xC0]), 0x1000, 1
+) == [raw[0]]
+try:
+    nyxstone.disassemble_to_raw(bytes([0xFF, 0xFF]))
+    assert False
+except ValueError:
+    pass
+
+# lazily disassembling instructions
+assert list(
+    nyxstone.disassemble_iter(bytes([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8]), 0x1000)
+) == nyxstone.disassemble_to_instructions(
+    bytes([0x48, 0x31, 0xC0, 0x48, 0x01, 0xD8]), 0x1000
+)
+nops = bytes([0x90] * 1000)
+assert len(list(nyxstone.disassemble_iter(nops))) == 1000
+assert len(list(nyxstone.disassemble_iter(nops, count=100))) == 100
+assert next(nyxstone.disassemble_iter(nops, 0x1000)) == Instruction(
+    0x1000, "nop", bytes([0x90])
+)
+try:
+    list(nyxstone.disassemble_iter(nops + bytes([0x0F, 0x0B, 0xFF])))
+    assert False, "Unreachable"
+except ValueError:
+    pass
+# instructions in front of an invalid one are yielded before the error is raised
+yielded = []
+try:
+    for instruction in nyxstone.disassemble_iter(
+        bytes([0x90] * 10 + [0x0F, 0x0B, 0xFF])
+    ):
+        yielded.append(instruction.assembly)
+    assert False, "Unreachable"
+except ValueError:
+    pass
+assert yielded == ["nop"] * 10 + ["ud2"]
+# the error reports the position within the whole byte code, like the other disassembly functions
+invalid = bytes([0x90] * 100 + [0xFF, 0xFF])
+try:
+    nyxstone.disassemble(invalid, 0x1000)
+    assert False, "Unreachable"
+except ValueError as error:
+    expected = str(error)
+assert "position 100 " in expected
+try:
+    list(nyxstone.disassemble_iter(invalid, 0x1000))
+    assert False, "Unreachable"
+except ValueError as error:
+    assert str(error) == expected
+# threads sharing an iterator of the C++ bindings each receive distinct instructions
+shared_iter = nyxstone.nyxstone.disassemble_iter(bytes([0x48, 0x31, 0xC0, 0x90] * 5000))
+with ThreadPoolExecutor(max_workers=8) as executor:
+    counts = executor.map(lambda _: sum(1 for _ in shared_iter), range(8))
+    assert sum(counts) == 10000
+
+# instruction details compare equal independent of the instruction type
+nop = nyxstone.disassemble_to_instructions(bytes([0x90]))[0]
+assert nop == nyxstone_cpp.Instruction(0x0, "nop", bytes([0x90]))
+assert nop == Instruction(0x0, "nop", bytes([0x90]))
+assert nop != Instruction(0x0, "nop", bytes([0x91]))
+assert nop != None
+assert nop.bytes == bytes([0x90])
+assert Instruction(0x0, "nop", [0x90]) == nop
+assert not hasattr(Instruction(0x0, "nop", bytes([0x90])), "__dict__")
+
+# batch assembling/disassembling
+assert nyxstone.assemble_many(
+    ["mov rax, rax", "jmp .label"], 0x1000, {".label": 0x1200}
+) == [
+    bytes([0x48, 0x89, 0xC0]),
+    bytes([0xE9, 0xFB, 0x01, 0x00, 0x00]),
+]
+assert nyxstone.disassemble_many([bytes([0x48, 0x31, 0xC0]), [0x48, 0x01, 0xD8]]) == [
+    "xor rax, rax\n",
+    "add rax, rbx\n",
+]
 
 # specify additional features
 nyxstone = Nyxstone("thumbv8", features="+mve.fp,+fp16")
@@ -42,12 +184,49 @@ nyxstone.assemble("vadd.f16 s0, s1, s2")
 # specify the immediate style
 nyxstone = Nyxstone("thumbv8", immediate_style=IntegerBase.HexPrefix)
 assert nyxstone.assemble_to_instructions("add r0, r0, #1") == [
-    Instruction(0x0, "add.w r0, r0, #0x1", [0x00, 0xF1, 0x01, 0x00])
+    Instruction(0x0, "add.w r0, r0, #0x1", bytes([0x00, 0xF1, 0x01, 0x00]))
 ]
 nyxstone = Nyxstone("thumbv8", immediate_style=IntegerBase.HexSuffix)
 assert nyxstone.assemble_to_instructions("add r0, r0, #1") == [
-    Instruction(0x0, "add.w r0, r0, #1h", [0x00, 0xF1, 0x01, 0x00])
+    Instruction(0x0, "add.w r0, r0, #1h", bytes([0x00, 0xF1, 0x01, 0x00]))
 ]
+# the immediate styles of the C++ bindings are accepted as well
+nyxstone = Nyxstone("thumbv8", immediate_style=nyxstone_cpp.IntegerBase.HexPrefix)
+assert nyxstone.assemble_to_instructions("add r0, r0, #1") == [
+    Instruction(0x0, "add.w r0, r0, #0x1", bytes([0x00, 0xF1, 0x01, 0x00]))
+]
+try:
+    Nyxstone("thumbv8", immediate_style=7)
+    assert False, "Unreachable"
+except ValueError:
+    pass
+
+# instances with the same configuration share the underlying nyxstone instance
+assert Nyxstone("x86_64").nyxstone is Nyxstone("x86_64").nyxstone
+assert Nyxstone("x86_64").nyxstone is not Nyxstone("x86_64", cpu="znver3").nyxstone
+cached = Nyxstone("x86_64").nyxstone
+clear_cache()
+assert Nyxstone("x86_64").nyxstone is not cached
+
+# repeated assembly is served from the cache, which can be disabled
+assert nyxstone.assemble("add r0, r0, #1") is nyxstone.assemble("add r0, r0, #1")
+uncached = Nyxstone("thumbv8", cache_size=0)
+assert uncached.assemble("add r0, r0, #1") == nyxstone.assemble("add r0, r0, #1")
+
+# concurrent use from multiple threads
+with ThreadPoolExecutor(max_workers=4) as executor:
+    x86 = Nyxstone("x86_64")
+    # every task disassembles a different instruction, so mixed up results are noticed
+    results = executor.map(
+        lambda i: x86.disassemble(bytes([0x48, 0x83, 0xC0, i])), range(128)
+    )
+    assert list(results) == [f"add rax, {i}\n" for i in range(128)]
+    # a single instance is used by all threads at the same time
+    shared = Nyxstone("x86_64", cache_size=0)
+    results = executor.map(
+        lambda i: shared.disassemble(shared.assemble(f"add rax, {i}")), range(256)
+    )
+    assert list(results) == [f"add rax, {i}\n" for i in range(256)]
 
 # handling an error:
 try:
@@ -83,10 +83,7 @@ InstructionResult NyxstoneFFI::assemble_to_instructions(
 
 StringResult NyxstoneFFI::disassemble(const rust::Slice<const uint8_t> bytes, uint64_t address, size_t count) const
 {
-    std::vector<uint8_t> cpp_bytes;
-    cpp_bytes.reserve(bytes.size());
-    std::copy(bytes.begin(), bytes.end(), std::back_inserter(cpp_bytes));
-    std::string cpp_disassembly;
+    const llvm::ArrayRef<uint8_t> cpp_bytes { bytes.data(), bytes.size() };
 
     auto result = nyxstone->disassemble(cpp_bytes, address, count).map([](auto&& text) {
         return rust::String { std::move(text) };
@@ -98,10 +95,7 @@ StringResult NyxstoneFFI::disassemble(const rust::Slice<const uint8_t> bytes, ui
 InstructionResult NyxstoneFFI::disassemble_to_instructions(
     const rust::Slice<const uint8_t> bytes, uint64_t address, size_t count) const
 {
-    std::vector<uint8_t> cpp_bytes {};
-    cpp_bytes.reserve(bytes.size());
-    std::copy(bytes.begin(), bytes.end(), std::back_inserter(cpp_bytes));
-    std::vector<Nyxstone::Instruction> cpp_instructions {};
+    const llvm::ArrayRef<uint8_t> cpp_bytes { bytes.data(), bytes.size() };
 
     auto result
         = nyxstone->disassemble_to_instructions(cpp_bytes, address, count).map([](const auto& cpp_instructions) {
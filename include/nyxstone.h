@@ -2,6 +2,7 @@
 
 #include "tl/expected.hpp"
 
+#include <llvm/ADT/ArrayRef.h>
 #include <llvm/MC/MCAsmInfo.h>
 #include <llvm/MC/MCInstPrinter.h>
 #include <llvm/MC/MCInstrInfo.h>
@@ -15,6 +16,9 @@ using u8 = uint8_t;
 using u64 = uint64_t;
 
 /// Nyxstone class for assembling and disassembling for a given architecture.
+///
+/// The LLVM objects of an instance are only read while assembling and disassembling, all mutable LLVM state is created
+/// per call. Thus, an instance can be used from multiple threads concurrently.
 class Nyxstone {
 public:
     /// @brief Defines the location of a label by absolute address.
@@ -37,6 +41,18 @@ public:
         bool operator==(const Instruction& other) const;
     };
 
+    /// @brief Decoded instruction information without disassembly text.
+    struct RawInstruction {
+        /// The absolute address of the instruction
+        uint64_t address;
+        /// The LLVM opcode of the instruction
+        unsigned opcode;
+        /// The byte code of the instruction
+        std::vector<uint8_t> bytes {};
+
+        bool operator==(const RawInstruction& other) const;
+    };
+
     /// @brief Nyxstone constructor called by NyxstoneBuilder::build.
     ///
     /// @warning This function should not be called directly, use NyxstoneBuilder instead.
@@ -50,11 +66,13 @@ public:
     /// @param assembler_info Assembler info for given triple.
     /// @param instruction_info Instruction information for the given triple.
     /// @param subtarget_info Information about the subtarget, created with @p cpu and @p features.
-    /// @param instruction_printer Instruction printer for the given architecture.
+    /// @param syntax_variant Assembler dialect of the instruction printer.
+    /// @param print_imm_hex Whether the instruction printer prints immediates in hex.
+    /// @param print_hex_style Style of hex immediates printed by the instruction printer.
     Nyxstone(llvm::Triple&& triple, const llvm::Target& target, llvm::MCTargetOptions&& target_options,
         std::unique_ptr<llvm::MCRegisterInfo>&& register_info, std::unique_ptr<llvm::MCAsmInfo>&& assembler_info,
         std::unique_ptr<llvm::MCInstrInfo>&& instruction_info, std::unique_ptr<llvm::MCSubtargetInfo>&& subtarget_info,
-        std::unique_ptr<llvm::MCInstPrinter>&& instruction_printer) noexcept
+        unsigned syntax_variant, bool print_imm_hex, llvm::HexStyle::Style print_hex_style) noexcept
         : triple(std::move(triple))
         , target(target)
         , target_options(std::move(target_options))
@@ -62,7 +80,9 @@ public:
         , assembler_info(std::move(assembler_info))
         , instruction_info(std::move(instruction_info))
         , subtarget_info(std::move(subtarget_info))
-        , instruction_printer(std::move(instruction_printer))
+        , syntax_variant(syntax_variant)
+        , print_imm_hex(print_imm_hex)
+        , print_hex_style(print_hex_style)
     {
     }
 
@@ -99,8 +119,7 @@ public:
     /// @param count The number of instructions which should be disassembled, 0 means all.
     ///
     /// @return The disassembly on success, an error string otherwise.
-    tl::expected<std::string, std::string> disassemble(
-        const std::vector<uint8_t>& bytes, uint64_t address, size_t count) const;
+    tl::expected<std::string, std::string> disassemble(llvm::ArrayRef<u8> bytes, uint64_t address, size_t count) const;
 
     /// @brief Translates bytes to instruction details containing disassembly text at given start address.
     ///
@@ -110,9 +129,23 @@ public:
     ///
     /// @return The instruction details on success, an error string otherwise.
     tl::expected<std::vector<Instruction>, std::string> disassemble_to_instructions(
-        const std::vector<uint8_t>& bytes, uint64_t address, size_t count) const;
+        llvm::ArrayRef<u8> bytes, uint64_t address, size_t count) const;
+
+    /// @brief Decodes bytes to raw instruction details at given start address without generating disassembly text.
+    ///
+    /// @param bytes The byte code to be decoded.
+    /// @param address The absolute address of the byte code.
+    /// @param count The number of instructions which should be decoded, 0 means all.
+    ///
+    /// @return The raw instruction details on success, an error string otherwise.
+    tl::expected<std::vector<RawInstruction>, std::string> disassemble_to_raw_instructions(
+        llvm::ArrayRef<u8> bytes, uint64_t address, size_t count) const;
 
 private:
+    // Creates an instruction printer configured for this instance, returns nullptr on failure.
+    // Instruction printers hold mutable state, thus each call creates its own printer.
+    std::unique_ptr<llvm::MCInstPrinter> create_instruction_printer() const;
+
     // Uses LLVM to assemble instructions.
     // Utilizes some custom overloads to import user-supplied label definitions and extract instruction details.
     tl::expected<void, std::string> assemble_impl(const std::string& assembly, uint64_t address,
@@ -120,8 +153,10 @@ private:
         std::vector<Instruction>* instructions) const;
 
     // Uses LLVM to disassemble instructions.
-    tl::expected<void, std::string> disassemble_impl(const std::vector<uint8_t>& bytes, uint64_t address, size_t count,
-        std::string* disassembly, std::vector<Instruction>* instructions) const;
+    // Only prints the instructions if @p disassembly or @p instructions is requested.
+    tl::expected<void, std::string> disassemble_impl(llvm::ArrayRef<u8> bytes, uint64_t address, size_t count,
+        std::string* disassembly, std::vector<Instruction>* instructions,
+        std::vector<RawInstruction>* raw_instructions) const;
 
     /// The LLVM triple
     llvm::Triple triple;
@@ -135,7 +170,11 @@ private:
     std::unique_ptr<llvm::MCAsmInfo> assembler_info;
     std::unique_ptr<llvm::MCInstrInfo> instruction_info;
     std::unique_ptr<llvm::MCSubtargetInfo> subtarget_info;
-    std::unique_ptr<llvm::MCInstPrinter> instruction_printer;
+
+    // Configuration of the instruction printers
+    unsigned syntax_variant;
+    bool print_imm_hex;
+    llvm::HexStyle::Style print_hex_style;
 };
 
 /**
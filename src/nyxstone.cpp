@@ -90,24 +90,25 @@ tl::expected<std::unique_ptr<Nyxstone>, std::string> NyxstoneBuilder::build()
         return tl::unexpected("Could not create LLVM object (= MCSubtargetInfo )");
     }
 
-    // Create instruction printer
+    // Configure instruction printer, which is created per call
     // For x86 and x86_64 switch to intel assembler dialect
     auto syntax_variant = assembler_info->getAssemblerDialect();
     if (triple.getArch() == llvm::Triple::x86 || triple.getArch() == llvm::Triple::x86_64) {
         syntax_variant = 1;
     }
-    auto instruction_printer = std::unique_ptr<llvm::MCInstPrinter>(
-        target->createMCInstPrinter(triple, syntax_variant, *assembler_info, *instruction_info, *register_info));
-    if (!instruction_printer) {
+    if (!std::unique_ptr<llvm::MCInstPrinter>(
+            target->createMCInstPrinter(triple, syntax_variant, *assembler_info, *instruction_info, *register_info))) {
         return tl::unexpected("Could not create LLVM object (= MCInstPrinter )");
     }
 
+    bool print_imm_hex = false;
+    auto print_hex_style = llvm::HexStyle::Style::C;
     switch (m_imm_style) {
     case IntegerBase::HexSuffix:
-        instruction_printer->setPrintHexStyle(llvm::HexStyle::Style::Asm);
+        print_hex_style = llvm::HexStyle::Style::Asm;
         [[fallthrough]];
     case IntegerBase::HexPrefix:
-        instruction_printer->setPrintImmHex(true);
+        print_imm_hex = true;
         break;
 
     case IntegerBase::Dec:
@@ -118,14 +119,28 @@ tl::expected<std::unique_ptr<Nyxstone>, std::string> NyxstoneBuilder::build()
     return std::make_unique<Nyxstone>(std::move(triple),
         // target is a static object, thus it is safe to take its reference here:
         *target, std::move(target_options), std::move(register_info), std::move(assembler_info),
-        std::move(instruction_info), std::move(subtarget_info), std::move(instruction_printer));
+        std::move(instruction_info), std::move(subtarget_info), syntax_variant, print_imm_hex, print_hex_style);
+}
+
+std::unique_ptr<llvm::MCInstPrinter> Nyxstone::create_instruction_printer() const
+{
+    auto instruction_printer = std::unique_ptr<llvm::MCInstPrinter>(
+        target.createMCInstPrinter(triple, syntax_variant, *assembler_info, *instruction_info, *register_info));
+    if (!instruction_printer) {
+        return nullptr;
+    }
+
+    instruction_printer->setPrintImmHex(print_imm_hex);
+    instruction_printer->setPrintHexStyle(print_hex_style);
+
+    return instruction_printer;
 }
 
 tl::expected<std::vector<u8>, std::string> Nyxstone::assemble(
     const std::string& assembly, uint64_t address, const std::vector<LabelDefinition>& labels) const
 {
     std::vector<u8> bytes;
-    return assemble_impl(assembly, address, labels, bytes, nullptr).transform([bytes]() { return bytes; });
+    return assemble_impl(assembly, address, labels, bytes, nullptr).transform([&bytes]() { return std::move(bytes); });
 }
 
 tl::expected<std::vector<Nyxstone::Instruction>, std::string> Nyxstone::assemble_to_instructions(
@@ -134,7 +149,7 @@ tl::expected<std::vector<Nyxstone::Instruction>, std::string> Nyxstone::assemble
     std::vector<Instruction> instructions;
     std::vector<u8> output_bytes;
     return assemble_impl(assembly, address, labels, output_bytes, &instructions)
-        .and_then([instructions, &output_bytes]() -> tl::expected<std::vector<Instruction>, std::string> {
+        .and_then([&instructions, &output_bytes]() -> tl::expected<std::vector<Instruction>, std::string> {
             // Pedantic: Ensure accumulated instruction byte length matches output byte length
             // This also leads to nyxstone not supporting directives which insert data into the assembly,
             // since the bytes will not match the assembled instructions.
@@ -147,28 +162,36 @@ tl::expected<std::vector<Nyxstone::Instruction>, std::string> Nyxstone::assemble
                 return tl::unexpected(error_stream.str());
             }
 
-            return instructions;
+            return std::move(instructions);
         });
 }
 
 tl::expected<std::string, std::string> Nyxstone::disassemble(
-    const std::vector<uint8_t>& bytes, uint64_t address, size_t count) const
+    llvm::ArrayRef<u8> bytes, uint64_t address, size_t count) const
 {
     std::string disassembly;
-    return disassemble_impl(bytes, address, count, &disassembly, nullptr).transform([disassembly]() {
-        return disassembly;
+    return disassemble_impl(bytes, address, count, &disassembly, nullptr, nullptr).transform([&disassembly]() {
+        return std::move(disassembly);
     });
 }
 
 tl::expected<std::vector<Nyxstone::Instruction>, std::string> Nyxstone::disassemble_to_instructions(
-    const std::vector<uint8_t>& bytes, uint64_t address, size_t count) const
+    llvm::ArrayRef<u8> bytes, uint64_t address, size_t count) const
 {
     std::vector<Nyxstone::Instruction> instructions;
-    return disassemble_impl(bytes, address, count, nullptr, &instructions).transform([instructions]() {
-        return instructions;
+    return disassemble_impl(bytes, address, count, nullptr, &instructions, nullptr).transform([&instructions]() {
+        return std::move(instructions);
     });
 }
 
+tl::expected<std::vector<Nyxstone::RawInstruction>, std::string> Nyxstone::disassemble_to_raw_instructions(
+    llvm::ArrayRef<u8> bytes, uint64_t address, size_t count) const
+{
+    std::vector<Nyxstone::RawInstruction> raw_instructions;
+    return disassemble_impl(bytes, address, count, nullptr, nullptr, &raw_instructions)
+        .transform([&raw_instructions]() { return std::move(raw_instructions); });
+}
+
 namespace {
     const char* const PREPENDED_ASSEMBLY { "bkpt #0x42\n" };
     constexpr std::array<uint8_t, 2> PREPENDED_BYTES { 0x42, 0xbe };
@@ -306,6 +329,13 @@ tl::expected<void, std::string> Nyxstone::assemble_impl(const std::string& assem
         error_stream << "ELF does not support target triple '" << triple.getTriple() << "'.";
         return tl::unexpected(error_stream.str());
     }
+
+    // Create instruction printer
+    auto instruction_printer = create_instruction_printer();
+    if (!instruction_printer) {
+        return tl::unexpected("Could not create LLVM object (= MCInstPrinter )");
+    }
+
     auto streamer = ELFStreamerWrapper::createELFStreamerWrapper(context, std::move(assembler_backend),
         std::move(object_writer_wrapper), std::move(code_emitter),
         /* RelaxAll */ false, instructions, extended_error, *instruction_printer);
@@ -356,12 +386,11 @@ tl::expected<void, std::string> Nyxstone::assemble_impl(const std::string& assem
         return tl::unexpected(error_stream.str());
     }
 
-    auto res = remove_bkpt(output_bytes, instructions, needs_prepend).transform([&bytes](const auto& output) -> void {
-        // Copy bytes to output
-        bytes.clear();
-        bytes.reserve(output.size());
-        std::copy(output.begin(), output.end(), std::back_inserter(bytes));
-    });
+    auto res = remove_bkpt(std::move(output_bytes), instructions, needs_prepend)
+                   .transform([&bytes](const auto& output) -> void {
+                       // Copy bytes to output
+                       bytes.assign(output.begin(), output.end());
+                   });
 
     // Assign addresses if instruction details requested
     if (instructions != nullptr) {
@@ -375,10 +404,11 @@ tl::expected<void, std::string> Nyxstone::assemble_impl(const std::string& assem
     return res;
 }
 
-tl::expected<void, std::string> Nyxstone::disassemble_impl(const std::vector<uint8_t>& bytes, uint64_t address,
-    size_t count, std::string* disassembly, std::vector<Instruction>* instructions) const
+tl::expected<void, std::string> Nyxstone::disassemble_impl(llvm::ArrayRef<u8> bytes, uint64_t address, size_t count,
+    std::string* disassembly, std::vector<Instruction>* instructions,
+    std::vector<RawInstruction>* raw_instructions) const
 {
-    if (disassembly == nullptr && instructions == nullptr) {
+    if (disassembly == nullptr && instructions == nullptr && raw_instructions == nullptr) {
         return {};
     }
 
@@ -388,6 +418,12 @@ tl::expected<void, std::string> Nyxstone::disassemble_impl(const std::vector<uin
     if (instructions != nullptr) {
         instructions->clear();
     }
+    if (raw_instructions != nullptr) {
+        raw_instructions->clear();
+    }
+
+    // Printing is the most expensive part of the disassembly, skip it if no text is requested
+    const bool print = disassembly != nullptr || instructions != nullptr;
 
     if (bytes.empty()) {
         return {};
@@ -414,8 +450,17 @@ tl::expected<void, std::string> Nyxstone::disassemble_impl(const std::vector<uin
         return tl::unexpected("Invalid architecture / LLVM target triple");
     }
 
+    // Create instruction printer if text is requested
+    std::unique_ptr<llvm::MCInstPrinter> instruction_printer;
+    if (print) {
+        instruction_printer = create_instruction_printer();
+        if (!instruction_printer) {
+            return tl::unexpected("Could not create LLVM object (= MCInstPrinter )");
+        }
+    }
+
     // Disassemble
-    const llvm::ArrayRef<u8> data(bytes.data(), bytes.size());
+    const llvm::ArrayRef<u8> data = bytes;
     uint64_t pos = 0;
     uint64_t insn_count = 0;
     while (true) {
@@ -432,29 +477,39 @@ tl::expected<void, std::string> Nyxstone::disassemble_impl(const std::vector<uin
             return tl::unexpected(error_stream.str());
         }
 
-        // Generate instruction disassembly text
-        std::string insn_str;
-        llvm::raw_string_ostream str_stream(insn_str);
-        instruction_printer->printInst(&insn,
-            /* Address */ address + pos,
-            /* Annot */ "", *subtarget_info, str_stream);
-
-        // left trim
-        insn_str.erase(0, insn_str.find_first_not_of(" \t\n\r"));
-        // convert tabulators to spaces
-        std::replace(insn_str.begin(), insn_str.end(), '\t', ' ');
-
-        // Add instruction to results
-        if (disassembly != nullptr) {
-            *disassembly += insn_str + "\n";
-        }
-        if (instructions != nullptr) {
-            Nyxstone::Instruction new_insn;
+        if (raw_instructions != nullptr) {
+            Nyxstone::RawInstruction new_insn;
             new_insn.address = address + pos;
-            new_insn.assembly = insn_str;
-            new_insn.bytes.reserve(insn_size);
-            std::copy(data.begin() + pos, data.begin() + pos + insn_size, std::back_inserter(new_insn.bytes));
-            instructions->push_back(new_insn);
+            new_insn.opcode = insn.getOpcode();
+            new_insn.bytes.assign(data.begin() + pos, data.begin() + pos + insn_size);
+            raw_instructions->push_back(std::move(new_insn));
+        }
+
+        if (print) {
+            // Generate instruction disassembly text
+            std::string insn_str;
+            llvm::raw_string_ostream str_stream(insn_str);
+            instruction_printer->printInst(&insn,
+                /* Address */ address + pos,
+                /* Annot */ "", *subtarget_info, str_stream);
+
+            // left trim
+            insn_str.erase(0, insn_str.find_first_not_of(" \t\n\r"));
+            // convert tabulators to spaces
+            std::replace(insn_str.begin(), insn_str.end(), '\t', ' ');
+
+            // Add instruction to results
+            if (disassembly != nullptr) {
+                *disassembly += insn_str + "\n";
+            }
+            if (instructions != nullptr) {
+                Nyxstone::Instruction new_insn;
+                new_insn.address = address + pos;
+                new_insn.assembly = insn_str;
+                new_insn.bytes.reserve(insn_size);
+                std::copy(data.begin() + pos, data.begin() + pos + insn_size, std::back_inserter(new_insn.bytes));
+                instructions->push_back(new_insn);
+            }
         }
 
         // Abort after n instructions if requested
@@ -478,6 +533,11 @@ bool Nyxstone::Instruction::operator==(const Instruction& other) const
     return address == other.address && assembly == other.assembly && bytes == other.bytes;
 }
 
+bool Nyxstone::RawInstruction::operator==(const RawInstruction& other) const
+{
+    return address == other.address && opcode == other.opcode && bytes == other.bytes;
+}
+
 /// Detects all ARM Thumb architectures. LLVM doesn't seem to have a short way to check this.
 bool is_ArmT16_or_ArmT32(const llvm::Triple& triple)
 {